@@ -19,7 +19,7 @@ from watchdog.events import FileSystemEventHandler
 
 from config.load_config import load_config, format_pydantic_error, ConfigLoadError
 from docker_monitoring.monitor import DockerLogMonitor
-from notifier import send_notification
+from notifier import send_notification, stop_notification_worker
 from utils import convert_to_int
 
 logging.basicConfig(
@@ -33,6 +33,11 @@ logging.getLogger("urllib3.connectionpool").setLevel(logging.WARNING)
 logging.getLogger("docker").setLevel(logging.INFO)
 logging.getLogger("watchdog").setLevel(logging.WARNING)
 
+# Each monitored container keeps one pooled connection busy with its log stream.
+# docker-py only keeps 10 connections per host, so with more containers every other API call
+# would open a new connection and discard it afterwards ("Connection pool is full").
+DOCKER_MAX_POOL_SIZE = convert_to_int(os.getenv("DOCKER_MAX_POOL_SIZE"), fallback_value=100, min_value=1)
+
 
 @dataclass
 class DockerClientInfo:
@@ -247,7 +252,7 @@ def check_monitor_status(docker_host_infos: List[DockerClientInfo], global_shutd
                         return
                     new_client = None
                     try:    
-                        new_client = docker.DockerClient(base_url=host_url, tls=tls_config)
+                        new_client = docker.DockerClient(base_url=host_url, tls=tls_config, max_pool_size=DOCKER_MAX_POOL_SIZE)
                     except docker.errors.DockerException as e:
                         logging.warning(f"Could not reconnect to {host_url} ({label}): {e}")
                     except Exception as e:
@@ -344,9 +349,9 @@ def create_docker_clients() -> list[DockerClientInfo]:
                 if client.ping():
                     logging.info(f"Successfully connected to Podman client on {host_url}")
                     client.close()
-                    client = docker.DockerClient(base_url=host_url, tls=tls_config, timeout=300)
+                    client = docker.DockerClient(base_url=host_url, tls=tls_config, timeout=300, max_pool_size=DOCKER_MAX_POOL_SIZE)
             else:
-                client = docker.DockerClient(base_url=host_url, tls=tls_config, timeout=10)
+                client = docker.DockerClient(base_url=host_url, tls=tls_config, timeout=10, max_pool_size=DOCKER_MAX_POOL_SIZE)
             if label: 
                 hostname = label
             else:
@@ -460,3 +465,5 @@ def start_loggifly():
 if __name__ == "__main__":
     global_shutdown_event = start_loggifly()
     global_shutdown_event.wait()
+    # Send the shutdown message and any other queued notifications before exiting
+    stop_notification_worker()
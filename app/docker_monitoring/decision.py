@@ -8,6 +8,7 @@ from config.config_model import ContainerConfig as ModelContainerConfig, SwarmSe
 from config.load_config import validate_unit_config
 from constants import MonitorType
 from docker_monitoring.helpers import ContainerSnapshot, parse_label_config
+from utils import cached_per_config
 
 if TYPE_CHECKING:
     from docker_monitoring.monitor import MonitoredContainerContext
@@ -117,20 +118,30 @@ class MonitorDecision:
             raise ValueError(f"Invalid monitor type: {ctx.monitor_type}")
             
     @staticmethod
+    @cached_per_config
     def _get_container_settings_for_host(global_config: GlobalConfig, hostname: str):
-        """Extract host-specific container settings."""
+        """Extract host-specific container settings. Computed once per config since it runs for every container."""
         host_config = global_config.hosts.get(hostname) if isinstance(global_config.hosts, dict) and hostname else None
         containers = dict(global_config.containers or {})
         if host_config:
             monitor_all_containers = host_config.monitor_all_containers if host_config.monitor_all_containers is not None else global_config.settings.monitor_all_containers
-            excluded_containers = host_config.excluded_containers or global_config.settings.excluded_containers or []
+            excluded_containers = frozenset(host_config.excluded_containers or global_config.settings.excluded_containers or ())
             containers.update(host_config.containers or {})
         else:
             monitor_all_containers = global_config.settings.monitor_all_containers
-            excluded_containers = global_config.settings.excluded_containers or []
+            excluded_containers = frozenset(global_config.settings.excluded_containers or ())
 
         return containers, monitor_all_containers, excluded_containers
 
+    @staticmethod
+    @cached_per_config
+    def _get_swarm_settings(global_config: GlobalConfig):
+        """Extract swarm service settings. Computed once per config since it runs for every swarm task."""
+        swarm_services = global_config.swarm_services or {}
+        monitor_all_swarm_services = global_config.settings.monitor_all_swarm_services
+        excluded_swarm_services = frozenset(global_config.settings.excluded_swarm_services or ())
+        return swarm_services, monitor_all_swarm_services, excluded_swarm_services
+
     @staticmethod
     def _is_excluded_for_host(unit_config: ModelContainerConfig | ModelSwarmServiceConfig, hostname: str) -> bool:
         if not hostname or not unit_config.hosts:
@@ -201,9 +212,7 @@ class MonitorDecision:
                 reason=f"label says loggifly.monitor=false ({label_source})"
             )
 
-        monitor_all_swarm_services = global_config.settings.monitor_all_swarm_services
-        excluded_swarm_services = global_config.settings.excluded_swarm_services or []
-        swarm_services = global_config.swarm_services or {}
+        swarm_services, monitor_all_swarm_services, excluded_swarm_services = cls._get_swarm_settings(global_config)
         # Check explicit config
         if swarm_services:
             if service_name in swarm_services:
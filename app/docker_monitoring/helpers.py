@@ -73,6 +73,42 @@ class ContainerSnapshot:
             labels=container.labels or {}
         )
 
+    @classmethod
+    def from_event(cls, event: dict) -> 'ContainerSnapshot | None':
+        """
+        Extract metadata from the attributes of a docker container event (name, image and container labels).
+        Returns None for swarm tasks since their service labels are not part of the event.
+        """
+        actor = event.get("Actor", {})
+        attributes = dict(actor.get("Attributes") or {})
+        if attributes.get("com.docker.swarm.service.id"):
+            return None
+        name = attributes.pop("name", "")
+        image = attributes.pop("image", "")
+        return cls(
+            name=name,
+            id=actor.get("ID", ""),
+            image=image,
+            labels=attributes
+        )
+
+    @classmethod
+    def from_summary(cls, summary: dict) -> 'ContainerSnapshot | None':
+        """
+        Extract metadata from a container list entry (GET /containers/json, docker-py's sparse containers).
+        Returns None for swarm tasks since their service labels are not part of the list entry.
+        """
+        labels = summary.get("Labels") or {}
+        if labels.get("com.docker.swarm.service.id"):
+            return None
+        names = summary.get("Names") or [""]
+        return cls(
+            name=names[0].lstrip("/"),
+            id=summary.get("Id", ""),
+            image=summary.get("Image", ""),
+            labels=labels
+        )
+
 @dataclass
 class ContainerActionResult:
     """Result of a container action attempt"""
@@ -1,4 +1,6 @@
+import atexit
 import logging
+import queue
 import threading
 import socket
 import traceback
@@ -7,6 +9,8 @@ import os
 import random
 import requests
 from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
 import docker
 from docker.models.containers import Container
 import docker.errors
@@ -32,6 +36,10 @@ from docker_monitoring.helpers import (
     validate_container_for_action, container_action, ContainerActionResult,
     ContainerActionError, ContainerValidationError,
 )
+
+MAX_BUFFER_SIZE = 10 * 1024 * 1024  # 10MB, limit for an incomplete log line in the log stream buffer
+STOP_EVENT_GRACE_SECONDS = 1.0  # how long a finished log stream waits for the stop/die event before inspecting the container
+
 class MonitoredContainerContext:
     """
     Runtime monitoring state for a container.
@@ -221,6 +229,7 @@ class DockerLogMonitor:
 
         self.loggifly_notification_title = f"[{self.host_identifier}] - LoggiFly" if self.host_identifier else "LoggiFly"
         self.event_stream = None
+        self.event_stream_connected = threading.Event()  # set while the event watcher is connected and receives events
         self.shutdown_event = threading.Event()
         self.cleanup_event = threading.Event()
         self.threads = []
@@ -257,12 +266,20 @@ class DockerLogMonitor:
         return identifier
 
     def _init_logging(self, formatter: logging.Formatter):
-        """Configure logger to include hostname for multi-host or swarm setups."""
+        """
+        Configure logger to include hostname for multi-host or swarm setups.
+        Monitoring threads only enqueue records, a single listener thread writes them to stderr.
+        """
         self.logger = logging.getLogger(f"Monitor-{self.hostname}")
         self.logger.handlers.clear()
         handler = logging.StreamHandler()
         handler.setFormatter(formatter)
-        self.logger.addHandler(handler)
+        self._log_queue = queue.SimpleQueue()
+        self.logger.addHandler(QueueHandler(self._log_queue))
+        self._log_listener = QueueListener(self._log_queue, handler)
+        self._log_listener.start()
+        # Not stopped in cleanup() since the monitor is reused after reconnecting to the docker host
+        atexit.register(self._log_listener.stop)
         self.log_level = self.config.settings.log_level.upper()
         self.logger.setLevel(getattr(logging, self.log_level, logging.INFO))
         self.logger.propagate = False
@@ -282,6 +299,8 @@ class DockerLogMonitor:
 
     def _add_thread(self, thread):
         with self.threads_lock:
+            # Drop finished threads so closures of old monitoring threads (container objects, contexts) can be freed
+            self.threads = [t for t in self.threads if t.is_alive()]
             self.threads.append(thread)
 
     def _maybe_monitor_container(self, container: Container) -> bool:
@@ -327,6 +346,25 @@ class DockerLogMonitor:
         self._start_monitoring_thread(container, container_context)
         return True
 
+    def _may_monitor(self, snapshot: ContainerSnapshot | None) -> bool:
+        """
+        Evaluate the monitoring decision on a snapshot built from a docker event or container list entry.
+        Used to skip inspecting containers that are not going to be monitored anyway.
+        Swarm tasks (snapshot is None) always need to be inspected since their service labels are not known yet.
+        """
+        if snapshot is None or not snapshot.name:
+            return True
+        try:
+            decision = MonitorDecision.evaluate(
+                snapshot=snapshot,
+                global_config=self.config,
+                hostname=self.hostname,
+            )
+        except Exception as e:
+            self.logger.debug(f"Could not evaluate container {snapshot.name} before inspecting it: {e}")
+            return True
+        return decision.should_monitor
+
     def _prepare_monitored_container_context(
         self, 
         container, 
@@ -360,7 +398,6 @@ class DockerLogMonitor:
                 ctx.currently_configured = True
                 ctx.not_monitored_since = None
                 ctx.processor.load_config_variables(self.config, decision.unit_config)
-                ctx.processor.start_flush_thread_if_needed()
                 return ctx
 
         ctx = MonitoredContainerContext(
@@ -406,9 +443,43 @@ class DockerLogMonitor:
         self._stop_and_close_stream(container_context, wait_for_thread=wait_for_thread, wait_timeout=wait_timeout)
         self._registry.remove(container_context.container_id)
 
-           
+    def _stop_and_remove_all_contexts(self, wait_timeout: float = 2.0):
+        """
+        Stop all monitoring threads in a single pass.
+        The streams are closed concurrently and the threads share one wait deadline
+        instead of waiting up to wait_timeout for each container one after another.
+        """
+        contexts = [ctx for ctx in self._registry.get_actively_monitored() if ctx.log_stream is not None]
+        if not contexts:
+            return
+        with ThreadPoolExecutor(max_workers=min(8, len(contexts))) as executor:
+            list(executor.map(lambda ctx: self._stop_and_close_stream(ctx, wait_for_thread=False), contexts))
+        deadline = time.monotonic() + wait_timeout
+        for ctx in contexts:
+            if not ctx.monitoring_stopped_event.wait(max(0.0, deadline - time.monotonic())):
+                self.logger.debug(f"Monitoring thread for {ctx.unit_name} did not stop within {wait_timeout} seconds.")
+            self._registry.remove(ctx.container_id)
+
+    def _list_unmonitored_candidates(self) -> list[Container]:
+        """
+        Return the running containers that are not actively monitored but could be monitored with the current config.
+        containers.list() inspects every running container on the host (one API call each),
+        so the containers are listed without inspecting them and only the candidates are fetched.
+        """
+        candidates = []
+        for summary in self.client.containers.list(sparse=True):
+            if self._registry.is_monitored(summary.id):
+                continue
+            if not self._may_monitor(ContainerSnapshot.from_summary(summary.attrs)):
+                continue
+            try:
+                candidates.append(self.client.containers.get(summary.id))
+            except docker.errors.NotFound:
+                self.logger.debug(f"Container {summary.id} was removed before it could be inspected.")
+        return candidates
+
     def start(self) -> str:
-        for container in self.client.containers.list():
+        for container in self._list_unmonitored_candidates():
             self._maybe_monitor_container(container)
         self._watch_events()
         return self._start_message()
@@ -448,11 +519,9 @@ class DockerLogMonitor:
                     ctx.processor.load_config_variables(self.config, ctx.unit_config)
                     ctx.currently_configured = True
             # start monitoring containers that are in the config but not monitored yet
-            for container in self.client.containers.list():
-                # Only start monitoring containers that are newly added to the config.yaml and not monitored yet
-                ctx = self._registry.get_by_id(container.id)
-                if not ctx or ctx.monitoring_stopped_event.is_set():
-                    self._maybe_monitor_container(container)
+            # Only start monitoring containers that are newly added to the config.yaml and not monitored yet
+            for container in self._list_unmonitored_candidates():
+                self._maybe_monitor_container(container)
 
             return self._start_message()
         except Exception as e:
@@ -473,13 +542,17 @@ class DockerLogMonitor:
             )
 
         selected_containers, selected_swarm_services = get_configured(self.config, self.hostname)
+        # Take one snapshot of the registry and split it by monitor type
+        actively_monitored_containers, actively_monitored_swarm = [], []
+        for ctx in self._registry.get_actively_monitored():
+            if ctx.monitor_type == MonitorType.SWARM:
+                actively_monitored_swarm.append(ctx)
+            else:
+                actively_monitored_containers.append(ctx)
         # --- Standalone containers ---
-        monitored_containers = [
-            c.unit_name
-            for c in self._registry.get_actively_monitored(monitor_type=MonitorType.CONTAINER)
-        ]
-        monitored_set = set(monitored_containers)
-        configured_not_running = sorted(set(selected_containers) - monitored_set)
+        monitored_containers = [c.unit_name for c in actively_monitored_containers]
+        # format_section sorts the items
+        configured_not_running = list(set(selected_containers).difference(monitored_containers))
         container_block = "\n\n".join(
             s for s in [
                 format_section(f"✅ Running & monitored containers ({len(monitored_containers)})", monitored_containers),
@@ -488,10 +561,9 @@ class DockerLogMonitor:
             if s
         )
         # --- Swarm ---
-        actively_monitored_swarm = list(self._registry.get_actively_monitored(monitor_type=MonitorType.SWARM))
         monitored_swarm_tasks = [x.unit_name for x in actively_monitored_swarm]
         monitored_swarm_service_keys = {x.config_key for x in actively_monitored_swarm}
-        swarm_services_not_running = sorted(set(selected_swarm_services) - monitored_swarm_service_keys)
+        swarm_services_not_running = list(set(selected_swarm_services) - monitored_swarm_service_keys)
         swarm_block = "\n\n".join(
             s for s in [
                 format_section(f"✅ Running & monitored Swarm tasks / containers ({len(monitored_swarm_tasks)})", monitored_swarm_tasks),
@@ -540,11 +612,18 @@ class DockerLogMonitor:
 
     def _start_monitoring_thread(self, container, container_context: MonitoredContainerContext):
         """Start a monitoring thread for a specific container."""
-        def check_container(container_start_time, error_count):
+        def check_container(container_start_time, error_count, stream_failed):
             """
             Check if the container is still running and matches the original start time.
             Used to stop monitoring if the container is stopped or replaced.
+            While the event watcher is connected, stops and restarts are signalled through the stop/die and start events,
+            so the container is only inspected when the log stream ended without an error and no stop event arrived.
             """
+            if self.event_stream_connected.is_set():
+                if container_context.stop_monitoring_event.wait(STOP_EVENT_GRACE_SECONDS):
+                    return False
+                if stream_failed:
+                    return True
             try:
                 container.reload()
                 if container.status != "running":
@@ -587,34 +666,47 @@ class DockerLogMonitor:
                 self.logger.error(f"Processor not found for container {unit_name}. Stopping monitoring.")
                 stop_monitoring_event.set() 
             log_stream = None
+            process_line = processor.process_line if processor else None
             while not self.shutdown_event.is_set() and not stop_monitoring_event.is_set():
-                buffer = b""
+                buffer = bytearray()
                 not_found_error = False
+                stream_failed = False
                 try:
-                    now = datetime.now()
+                    now = int(time.time())
                     log_stream = container.logs(stream=True, follow=True, since=now)
                     container_context.log_stream = log_stream
                     monitoring_stopped_event.clear()
                     self.logger.info(f"Monitoring for Container started: {unit_name}")
                     for chunk in log_stream:
-                        MAX_BUFFER_SIZE = 10 * 1024 * 1024  # 10MB
-                        buffer += chunk
-                        if len(buffer) > MAX_BUFFER_SIZE:
-                            self.logger.error(f"{unit_name}: Buffer overflow detected for container, resetting")
-                            buffer = b""
-                        while b'\n' in buffer:
-                            line, buffer = buffer.split(b'\n', 1)
+                        if not buffer and chunk.endswith(b'\n'):
+                            # Most chunks hold only complete lines: split them directly without copying them into the buffer
+                            lines = chunk.split(b'\n')
+                            lines.pop()
+                        else:
+                            buffer.extend(chunk)
+                            # Split all complete lines at once and keep only the trailing incomplete line in the buffer
+                            cut = buffer.rfind(b'\n')
+                            if cut < 0:
+                                if len(buffer) > MAX_BUFFER_SIZE:
+                                    self.logger.error(f"{unit_name}: Buffer overflow detected for container, resetting")
+                                    buffer.clear()
+                                continue
+                            lines = buffer[:cut].split(b'\n')
+                            del buffer[:cut + 1]
+                        for line in lines:
                             try:
-                                log_line_decoded = str(line.decode("utf-8")).strip()
+                                log_line_decoded = line.decode("utf-8")
                             except UnicodeDecodeError:
-                                log_line_decoded = line.decode("utf-8", errors="replace").strip()
-                                self.logger.warning(f"{unit_name}: Error while trying to decode a log line. Used errors='replace' for line: {log_line_decoded}")
-                            if log_line_decoded and processor:
-                                processor.process_line(log_line_decoded)
+                                log_line_decoded = line.decode("utf-8", errors="replace")
+                                self.logger.warning(f"{unit_name}: Error while trying to decode a log line. Used errors='replace' for line: {log_line_decoded.strip()}")
+                            log_line_decoded = log_line_decoded.strip()
+                            if log_line_decoded and process_line:
+                                process_line(log_line_decoded)
                 except docker.errors.NotFound as e:
                     self.logger.error(f"Container {unit_name} not found during Log Stream: {e}")
                     not_found_error = True
                 except Exception as e:
+                    stream_failed = True
                     error_count, last_error_time, too_many_errors = self._handle_error(error_count, last_error_time, unit_name)
                     if error_count == 1 or self.log_level == "DEBUG":  # log error only once
                         self.logger.error("Error trying to monitor %s: %s", unit_name, e)
@@ -626,7 +718,7 @@ class DockerLogMonitor:
                         self.logger.debug(f"{unit_name}: Stopping monitoring for old thread because a new thread was started for this container.")
                         break
                     if stop_monitoring_event.is_set() or too_many_errors or not_found_error \
-                    or check_container(container_start_time, error_count) is False:
+                    or check_container(container_start_time, error_count, stream_failed) is False:
                         break
                     self.logger.info(f"{unit_name}: Log Stream stopped. Reconnecting... {'error count: ' + str(error_count) if error_count > 0 else ''}")
             self.logger.info(f"Monitoring stopped for container {unit_name}.")
@@ -636,8 +728,8 @@ class DockerLogMonitor:
             monitoring_stopped_event.set()  
 
         thread = threading.Thread(target=log_monitor, daemon=True)
-        self._add_thread(thread)
         thread.start()
+        self._add_thread(thread)
         
     def _watch_events(self):
         """
@@ -659,6 +751,7 @@ class DockerLogMonitor:
                             "type": "container",
                         }, 
                         since=since_ts)
+                    self.event_stream_connected.set()
                     self.logger.info("Docker Event Watcher started. Watching for new containers...")
                     for event in self.event_stream:
                         if self.shutdown_event.is_set():
@@ -673,7 +766,8 @@ class DockerLogMonitor:
                             last_seen_time = int(event_time_ns / 1_000_000_000)
                         elif event_time := event.get("time"):
                             last_seen_time = int(event_time)
-                        if event.get("Action") == "start":
+                        # Only fetch the container from the API if the event attributes do not already rule out monitoring it
+                        if event.get("Action") == "start" and self._may_monitor(ContainerSnapshot.from_event(event)):
                             try:
                                 container = self.client.containers.get(container_id)
                             except docker.errors.NotFound:
@@ -689,6 +783,14 @@ class DockerLogMonitor:
                                 self.logger.debug(f"The Container {container_name or container_id} was stopped. Stopping Monitoring now.")
                                 self._stop_and_close_stream(ctx, wait_for_thread=False)
 
+                        elif event.get("Action") == "die":
+                            # A crashed container only emits "die". Do not close the stream here so that the last lines
+                            # (e.g. the crash trace) are still processed; the stream ends on its own and check_container sees the event.
+                            if ctx := self._registry.get_by_id(container_id):
+                                self.logger.debug(f"The Container {container_name or container_id} exited. Monitoring stops when its log stream ends.")
+                                ctx.stop_monitoring_event.set()
+                                ctx.not_monitored_since = datetime.now()
+
                         if (ctx:= self._registry.get_by_id(container_id)) and ctx.currently_configured:
                             self._process_event(event, ctx)
 
@@ -700,6 +802,8 @@ class DockerLogMonitor:
                         self.logger.error(f"Docker Event-Handler was stopped {e}. Trying to restart it.")
                         self.logger.debug(traceback.format_exc())
                 finally:
+                    # The stream ended (or failed), events may be missed until it is reconnected
+                    self.event_stream_connected.clear()
                     if self.shutdown_event.is_set() or too_many_errors:
                         self.logger.debug("Docker Event Watcher is shutting down.")
                         break
@@ -709,8 +813,8 @@ class DockerLogMonitor:
             self.event_stream = None
             
         thread = threading.Thread(target=event_handler, daemon=True)
-        self._add_thread(thread)
         thread.start()
+        self._add_thread(thread)
 
 
     def _process_event(self, event, ctx: MonitoredContainerContext):
@@ -762,9 +866,7 @@ class DockerLogMonitor:
         self.logger.info("Starting cleanup")
         self.cleanup_event.set()
         self.shutdown_event.set()
-        for context in self._registry.get_actively_monitored():
-            if context.log_stream is not None:
-                self._stop_and_remove_context(context)
+        self._stop_and_remove_all_contexts()
         if self.event_stream:
             try:
                 self.event_stream.close()
@@ -1,7 +1,9 @@
 import re
 import time
+import logging
 from typing import TYPE_CHECKING, Any
-import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from threading import Thread, Lock
 from config.config_model import GlobalConfig, KeywordItem, RegexItem, KeywordGroup, ContainerConfig, SwarmServiceConfig
 from constants import (
@@ -10,11 +12,100 @@ from constants import (
     NotificationType,
 )
 from notification_formatter import NotificationContext
-from utils import merge_modular_settings, merge_with_precedence
+from utils import merge_modular_settings, merge_with_precedence, cached_per_config
 from trigger import process_trigger
 if TYPE_CHECKING:
     from docker_monitoring.monitor import MonitoredContainerContext, DockerLogMonitor
 
+logger = logging.getLogger(__name__)
+
+
+def normalize_keywords(keywords, logger: logging.Logger = logger) -> list[dict]:
+    """
+    Normalize and return a list of keyword/regex dicts from various input types. 
+    """
+    returned_keywords = []
+    for item in keywords:
+        if isinstance(item, str):
+            returned_keywords.append(({"keyword": item}))
+            continue
+        if isinstance(item, (KeywordItem, RegexItem, KeywordGroup)):
+            item = item.model_dump(exclude_none=True)
+        if isinstance(item, dict) and "keyword_group" in item:
+            item["keyword_group"] = tuple(item["keyword_group"])
+            returned_keywords.append(item)
+        elif isinstance(item, dict) and ("keyword" in item or "regex" in item):
+            returned_keywords.append(item)
+        else:
+            logger.debug(f"Did not find correct item type for item: {item}")
+    return returned_keywords
+
+
+@cached_per_config
+def get_global_keywords(config: GlobalConfig) -> tuple[dict, ...]:
+    """Normalized global keywords, shared by all LogProcessor instances of the same config."""
+    return tuple(normalize_keywords(config.global_keywords.keywords))
+
+
+@cached_per_config
+def get_global_settings(config: GlobalConfig) -> dict:
+    """Global settings as a dict, shared by all LogProcessor instances of the same config."""
+    return config.settings.model_dump(exclude_none=True)
+
+
+class BufferFlusher:
+    """
+    Flushes the multi-line buffers of all LogProcessor instances from a single thread
+    instead of running one flush thread per container.
+    The thread only runs while at least one buffer is waiting to be flushed.
+    """
+
+    def __init__(self, interval: float = 1, max_workers: int = 4):
+        self.interval = interval
+        self._pending: set["LogProcessor"] = set()
+        self._lock = Lock()
+        self._thread: Thread | None = None
+        # Detached entries are processed here so that the flusher thread itself never blocks
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="buffer-flush")
+
+    def schedule(self, processor: "LogProcessor"):
+        """Register a processor whose buffer should be flushed once its log stream is idle."""
+        with self._lock:
+            self._pending.add(processor)
+            if self._thread is None:
+                self._thread = Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def discard(self, processor: "LogProcessor"):
+        with self._lock:
+            self._pending.discard(processor)
+
+    def _run(self):
+        # This thread must never block: it only checks for idle buffers and detaches them.
+        # Processing an entry can trigger notifications, container actions or log tails (blocking Docker calls),
+        # so the detached entries are processed by the executor to not delay the buffers of other containers.
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                pending = list(self._pending)
+            for processor in pending:
+                try:
+                    flushed = processor.flush_buffer_if_idle()
+                except Exception as e:
+                    processor.logger.error(f"Error while flushing buffer for {processor.unit_name}: {e}")
+                    self.discard(processor)
+                    continue
+                if flushed:
+                    self._executor.submit(processor.process_flushed_entries)
+            with self._lock:
+                if not self._pending:
+                    self._thread = None
+                    return
+
+
+buffer_flusher = BufferFlusher()
+
+
 class LogProcessor:
     """
     Processes Docker container log lines to:
@@ -58,8 +149,10 @@ class LogProcessor:
         self.patterns = []
         self.patterns_count = {pattern: 0 for pattern in self.__class__.COMPILED_STRICT_PATTERNS + self.__class__.COMPILED_FLEX_PATTERNS}
         self.lock_buffer = Lock()
-        self.flush_thread_stopped = threading.Event()
-        self.flush_thread_stopped.set()
+        # Entries detached from the buffer, processed in log order under lock_processing
+        self.flushed_entries: deque[str] = deque()
+        # Serializes keyword processing of this unit between the log stream thread and the BufferFlusher executor
+        self.lock_processing = Lock()
         
         self.waiting_for_pattern = False
         self.valid_pattern = False
@@ -76,7 +169,6 @@ class LogProcessor:
         # If multi-line mode is on, find starting pattern in logs
         if self.multi_line_mode is True:
             self.log_stream_last_updated = time.time()
-            self.new_line_event = threading.Event()
             self.buffer = []
             if self.valid_pattern is False:
                 log_tail = self._tail_logs(lines=100)
@@ -91,21 +183,7 @@ class LogProcessor:
         """
         Normalize and return a list of keyword/regex dicts from various input types. 
         """
-        returned_keywords = []
-        for item in keywords:
-            if isinstance(item, str):
-                returned_keywords.append(({"keyword": item}))
-                continue
-            if isinstance(item, (KeywordItem, RegexItem, KeywordGroup)):
-                item = item.model_dump(exclude_none=True)
-            if isinstance(item, dict) and "keyword_group" in item:
-                item["keyword_group"] = tuple(item["keyword_group"])
-                returned_keywords.append(item)
-            elif isinstance(item, dict) and ("keyword" in item or "regex" in item):
-                returned_keywords.append(item)
-            else:
-                self.logger.debug(f"Did not find correct item type for item: {item}")
-        return returned_keywords
+        return normalize_keywords(keywords, self.logger)
 
     def load_config_variables(self, config: GlobalConfig, unit_config):
         """
@@ -121,14 +199,13 @@ class LogProcessor:
         self.time_per_keyword = {}
         unt_cnf = self.unit_config.model_dump(exclude_none=True) if self.unit_config else {}
         
-        # Merge global and unit-specific keywords
+        # Merge global and unit-specific keywords (global keywords are normalized once per config and shared)
         self.keywords = self._get_keywords(unt_cnf.get("keywords", []))
-        self.keywords.extend(self._get_keywords(self.config.global_keywords.keywords))        
+        self.keywords.extend(get_global_keywords(self.config))
 
         # Merge message configuration with precedence: unit_config > global_config
-        self.unit_modular_settings = merge_modular_settings(unt_cnf, config.settings.model_dump(exclude_none=True))
+        self.unit_modular_settings = merge_modular_settings(unt_cnf, get_global_settings(config))
         self.multi_line_mode = config.settings.multi_line_entries
-        self.start_flush_thread_if_needed()
 
     def _find_starting_pattern(self, log):
         """
@@ -164,7 +241,6 @@ class LogProcessor:
                 self.patterns.append(pattern)
                 self.logger.debug(f"{self.unit_name}: Found pattern: {pattern} with {count} matches of {self.line_count} lines. {round(count / self.line_count * 100, 2)}%")
                 self.valid_pattern = True
-                self.start_flush_thread_if_needed()
         if self.line_count >= self.line_limit and not self.patterns:
             self.logger.info(f"{self.unit_name}: No pattern found in logs after {self.line_limit} lines. Mode: single-line")
 
@@ -178,52 +254,63 @@ class LogProcessor:
         """
         clean_line = re.sub(r"\x1b\[[0-9;]*m", "", line)  # Remove ANSI color codes
         if self.multi_line_mode is False:
-            self._search_and_send(clean_line)
+            with self.lock_processing:
+                self._search_and_send(clean_line)
         else:
             if self.line_count < self.line_limit:
                 self._find_starting_pattern(clean_line)
             if self.valid_pattern is True:
                 self._process_multi_line(clean_line)
             else:
-                self._search_and_send(clean_line)
+                with self.lock_processing:
+                    self._search_and_send(clean_line)
 
-    def start_flush_thread_if_needed(self):
-        """Start the buffer flush thread if multi-line mode is enabled and a valid pattern is detected."""
-        def check_flush():
-            """
-            Background thread: flushes buffer after one second passed since last log line.
-            """
-            self.logger.debug(f"Flush Thread started for {self.unit_name}.")
-            self.flush_thread_stopped.clear()
-            while not self.unit_stop_event.is_set():
-                # Wait for new line event to be set but check every 60 seconds if the unit is stopped
-                self.new_line_event.wait(60)
-                if not self.new_line_event.is_set():
-                    continue
-                # Check if buffer needs to be flushed after one second passed since last log line
-                while True:
-                    time.sleep(1)
-                    with self.lock_buffer:
-                        if (time.time() - self.log_stream_last_updated > 1) or self.unit_stop_event.is_set():
-                            if self.buffer:
-                                self._handle_and_clear_buffer()
-                                self.new_line_event.clear()
-                            break
-            self.flush_thread_stopped.set()
-            self.logger.debug(f"Flush Thread stopped for {self.unit_name}")
-
-        if not self.unit_stop_event.is_set() and self.multi_line_mode and self.valid_pattern and self.flush_thread_stopped.is_set():
-            self.flush_thread = Thread(target=check_flush, daemon=True)
-            self.flush_thread.start()
-
-    def _handle_and_clear_buffer(self):
-        """Flush buffer and process its contents as a single log entry."""
-        log_entry = "\n".join(self.buffer)
+    def flush_buffer_if_idle(self) -> bool:
+        """
+        Called by the shared BufferFlusher thread, must not block.
+        Detaches the buffer after one second passed since the last log line or when the unit is stopped.
+        Returns True if an entry was detached and has to be processed with process_flushed_entries().
+        """
+        with self.lock_buffer:
+            if (time.time() - self.log_stream_last_updated <= 1) and not self.unit_stop_event.is_set():
+                return False
+            flushed = bool(self.buffer)
+            if flushed:
+                self._detach_buffer()
+            # Discard while holding lock_buffer so that a line appended in the meantime re-schedules the flush
+            buffer_flusher.discard(self)
+        return flushed
+
+    def process_flushed_entries(self):
+        """Process the entries detached by the BufferFlusher (runs in the BufferFlusher executor)."""
+        try:
+            self._process_flushed_entries()
+        except Exception as e:
+            self.logger.error(f"Error while processing flushed buffer for {self.unit_name}: {e}")
+
+    def _detach_buffer(self):
+        """
+        Join the buffered lines into a single log entry, queue it for processing and clear the buffer.
+        Must be called with lock_buffer held so that entries are queued in log order.
+        """
+        self.flushed_entries.append("\n".join(self.buffer))
         self.buffer.clear()
-        if log_entry.strip():
-            self._search_and_send(log_entry)
-        else:
-            self.logger.debug(f"Buffer for {self.unit_name} was empty, nothing to process.")
+
+    def _process_flushed_entries(self):
+        """
+        Process all queued entries in log order.
+        lock_processing makes sure that only one thread at a time searches and sends for this unit.
+        """
+        with self.lock_processing:
+            while True:
+                try:
+                    log_entry = self.flushed_entries.popleft()
+                except IndexError:
+                    return
+                if log_entry.strip():
+                    self._search_and_send(log_entry)
+                else:
+                    self.logger.debug(f"Buffer for {self.unit_name} was empty, nothing to process.")
 
     def _process_multi_line(self, line: str):
         """
@@ -235,12 +322,14 @@ class LogProcessor:
             time.sleep(1)
         # Check if the line matches any start pattern
         self.log_stream_last_updated = time.time()
+        flushed = False
         with self.lock_buffer:
             for pattern in self.patterns:
                 # If line matches a start pattern, flush buffer and start new entry
                 if pattern.search(line):
                     if self.buffer:
-                        self._handle_and_clear_buffer()
+                        self._detach_buffer()
+                        flushed = True
                     self.buffer.append(line)
                     break
             # Otherwise, append to current buffer (continuation of previous entry)
@@ -250,8 +339,11 @@ class LogProcessor:
                 else:
                     # Fallback: unexpected format, start new buffer
                     self.buffer.append(line)
-        self.log_stream_last_updated = time.time()
-        self.new_line_event.set()
+            self.log_stream_last_updated = time.time()
+            buffer_flusher.schedule(self)
+        # Process the finished entry outside of lock_buffer so the BufferFlusher is never blocked by it
+        if flushed:
+            self._process_flushed_entries()
 
 
     def _search_keyword(self, log_line: str, keyword_dict: dict, ignore_keyword_time: bool = False) -> str | tuple | None:
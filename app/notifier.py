@@ -1,15 +1,22 @@
 import requests
-import apprise
+from requests.adapters import HTTPAdapter
 import os
+import queue
+import threading
+import time
 import base64
 import logging
 from pydantic import SecretStr
 import urllib.parse
+from typing import TYPE_CHECKING
 from config.config_model import GlobalConfig
 from email.header import Header
 from constants import EMOJI_PATTERN
 from notification_formatter import NotificationContext
-from utils import merge_with_precedence, LogAttachment
+from utils import merge_with_precedence, cached_per_config, LogAttachment
+
+if TYPE_CHECKING:
+    import apprise
 
 
 logger = logging.getLogger(__name__)
@@ -26,6 +33,25 @@ NTFY_PREFIX = "ntfy_"
 APPRISE_PREFIX = "apprise_"
 WEBHOOK_PREFIX = "webhook_"
 
+NTFY_MESSAGE_LIMIT = 3900
+APPRISE_MESSAGE_LIMIT = 1900
+SHORTENED_MESSAGE_PREFIX = "This message had to be shortened: \n"
+
+# Shared session so that consecutive notifications reuse keep-alive connections instead of a new TCP/TLS handshake each time
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=0))
+_SESSION.mount("http://", HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=0))
+_SESSION.headers.update({"User-Agent": "loggifly"})
+
+_apprise_instances: dict[str, "apprise.Apprise"] = {}
+_apprise_lock = threading.Lock()
+
+# Notifications are sent from a single sender thread so that slow notification services do not block log processing
+NOTIFICATION_QUEUE_SIZE = 1024
+_notification_queue: queue.Queue = queue.Queue(maxsize=NOTIFICATION_QUEUE_SIZE)
+_notification_worker: threading.Thread | None = None
+_notification_worker_lock = threading.Lock()
+
 
 def emoji_to_rfc2047(match):
     """Convert the matched emoji to RFC 2047 encoding."""
@@ -104,6 +130,13 @@ def build_ntfy_action_header(actions: list) -> str:
     header = ";".join(action_list) if actions else ""
     return header
 
+def shorten_message(message: str, limit: int) -> str:
+    """Truncate message to limit characters and mark it as shortened. Messages within the limit are returned as is."""
+    if len(message) <= limit:
+        return message
+    return SHORTENED_MESSAGE_PREFIX + message[:limit]
+
+
 def _normalize_and_strip_prefix(d: dict, prefix: str, keys: set[str]) -> dict:
     """Accept both prefixed (ntfy_url) and bare (url) keys; strip prefix if present."""
     out = {}
@@ -115,29 +148,61 @@ def _normalize_and_strip_prefix(d: dict, prefix: str, keys: set[str]) -> dict:
             out[base] = v
     return out
 
+@cached_per_config
+def get_global_notification_configs(config: GlobalConfig) -> tuple[dict, dict, dict]:
+    """
+    Return the normalized global ntfy, apprise and webhook configs.
+    Dumping the pydantic models is done once per config instead of for every notification.
+    """
+    nc = config.notifications.model_dump(exclude_none=True)
+    return (
+        _normalize_and_strip_prefix(nc.get("ntfy", {}), NTFY_PREFIX, NTFY_KEYS),
+        _normalize_and_strip_prefix(nc.get("apprise", {}), APPRISE_PREFIX, APPRISE_KEYS),
+        _normalize_and_strip_prefix(nc.get("webhook", {}), WEBHOOK_PREFIX, WEBHOOK_KEYS),
+    )
+
 def get_notification_config(modular_settings: dict, global_service_config: dict, prefix: str, keys: set[str]) -> dict:
     """
     Prepare a notification config with precedence: trigger > unit > global.
-    Keys may be provided with or without 'prefix' prefix.
+    Keys in modular_settings may be provided with or without 'prefix' prefix,
+    global_service_config is expected to be normalized already (see get_global_notification_configs).
+    Without overrides the global config itself is returned, so the result must not be mutated.
     """
+    overrides = _normalize_and_strip_prefix(modular_settings, prefix, keys)
+    if not overrides:
+        return global_service_config
     return merge_with_precedence(
-        _normalize_and_strip_prefix(modular_settings, prefix, keys),
-        _normalize_and_strip_prefix(global_service_config, prefix, keys),
+        overrides,
+        global_service_config,
         list_union=False,
         dict_merge=False,
     )
 
 
+def get_apprise_instance(url: str) -> "apprise.Apprise":
+    """
+    Return a cached Apprise instance for the url so that the url is only parsed once.
+    apprise is imported on first use since it is a large import that is not needed without an apprise url.
+    """
+    with _apprise_lock:
+        apobj = _apprise_instances.get(url)
+        if apobj is None:
+            import apprise
+            apobj = apprise.Apprise()
+            apobj.add(url)
+            _apprise_instances[url] = apobj
+        return apobj
+
+
 def send_apprise_notification(url, message, title, attachment: LogAttachment | None = None):
     """
     Send a notification using Apprise.
     Optionally attaches a file. Message is truncated if too long.
     """
-    message = ("This message had to be shortened: \n" if len(message) > 1900 else "") + message[:1900]
+    message = shorten_message(message, APPRISE_MESSAGE_LIMIT)
     file_path = None
     try:
-        apobj = apprise.Apprise()
-        apobj.add(url)
+        apobj = get_apprise_instance(url)
         if attachment:
             file_content = attachment.content
             file_name = attachment.file_name
@@ -183,17 +248,11 @@ def send_apprise_notification(url, message, title, attachment: LogAttachment | N
                 pass
 
 
-def send_ntfy_notification(ntfy_config, message, title, attachment: LogAttachment | None =None):
+def build_ntfy_base_headers(ntfy_config: dict) -> dict:
     """
-    Send a notification via ntfy with optional file attachment.
+    Build the ntfy headers that only depend on the ntfy config, i.e. everything except the title and attachment filename.
     """
-    message = ("This message had to be shortened: \n" if len(message) > 3900 else "") + message[:3900]
-    
-    title = replace_emojis_with_rfc2047(title)
-    title = title.replace("\n", " ").strip() if title else ""
-
     headers = {
-        "Title": title.encode("latin-1", errors="ignore").decode("latin-1").strip(),
         "Icon": "https://raw.githubusercontent.com/clemcer/LoggiFly/refs/heads/main/docs/public/icon.png",
         "Priority": f"{ntfy_config.get('priority', 3)}"
     }
@@ -217,6 +276,32 @@ def send_ntfy_notification(ntfy_config, message, title, attachment: LogAttachmen
         headers["Markdown"] = str(ntfy_config.get("markdown"))
     if ntfy_config.get("headers"):
         headers.update(ntfy_config.get("headers"))
+    return headers
+
+
+@cached_per_config
+def get_global_ntfy_base_headers(config: GlobalConfig) -> dict:
+    """Base headers for the global ntfy config, built once per config. Must not be mutated."""
+    return build_ntfy_base_headers(get_global_notification_configs(config)[0])
+
+
+def send_ntfy_notification(ntfy_config, message, title, attachment: LogAttachment | None =None, base_headers: dict | None = None):
+    """
+    Send a notification via ntfy with optional file attachment.
+    base_headers can be passed when they are already built for this ntfy_config (see get_global_ntfy_base_headers).
+    """
+    message = shorten_message(message, NTFY_MESSAGE_LIMIT)
+    
+    title = replace_emojis_with_rfc2047(title)
+    title = title.replace("\n", " ").strip() if title else ""
+
+    if base_headers is None:
+        base_headers = build_ntfy_base_headers(ntfy_config)
+    # Custom headers from the config can still override the title
+    headers = {
+        "Title": title.encode("latin-1", errors="ignore").decode("latin-1").strip(),
+        **base_headers,
+    }
     try:
         if attachment:
             file_content = attachment.content.encode("utf-8")
@@ -224,22 +309,25 @@ def send_ntfy_notification(ntfy_config, message, title, attachment: LogAttachmen
             # When attaching a file the message can not be passed normally.
             # So if the message is short, include it as query param, else omit it
             if len(message) < 199:
-                response = requests.post(
+                response = _SESSION.post(
                     f"{ntfy_config['url']}/{ntfy_config['topic']}?message={urllib.parse.quote(message)}",
                     data=file_content,
-                    headers=headers
+                    headers=headers,
+                    timeout=10
                 )
             else:
-                response = requests.post(
+                response = _SESSION.post(
                     f"{ntfy_config['url']}/{ntfy_config['topic']}",
                     data=file_content,
-                    headers=headers
+                    headers=headers,
+                    timeout=10
                 )
         else:
-            response = requests.post(
+            response = _SESSION.post(
                 f"{ntfy_config['url']}/{ntfy_config['topic']}",
                 data=message,
-                headers=headers
+                headers=headers,
+                timeout=10
             )
         if response.status_code == 200:
             logger.info("Ntfy-Notification sent successfully")
@@ -255,7 +343,7 @@ def send_webhook(json_data: dict, webhook_config: dict):
     """
     url, headers = webhook_config.get("url", ""), webhook_config.get("headers", {})
     try:
-        response = requests.post(
+        response = _SESSION.post(
             url=url,
             headers=headers,
             json=json_data,
@@ -269,6 +357,42 @@ def send_webhook(json_data: dict, webhook_config: dict):
         logger.error(f"Error trying to send webhook to url: {url}, headers: {headers}: %s", e)
 
 
+def _process_notification_queue():
+    """Sender thread: send queued notifications in order until a None sentinel is received."""
+    while True:
+        item = _notification_queue.get()
+        try:
+            if item is None:
+                return
+            _send_notification(**item)
+        except Exception as e:
+            logger.error(f"Unexpected error while sending notification: {e}")
+        finally:
+            _notification_queue.task_done()
+
+
+def _ensure_notification_worker():
+    global _notification_worker
+    with _notification_worker_lock:
+        if _notification_worker is None or not _notification_worker.is_alive():
+            _notification_worker = threading.Thread(target=_process_notification_queue, daemon=True)
+            _notification_worker.start()
+
+
+def stop_notification_worker(timeout: float = 10):
+    """Send the notifications that are still queued and stop the sender thread. Called on shutdown."""
+    with _notification_worker_lock:
+        worker = _notification_worker
+    if worker is None or not worker.is_alive():
+        return
+    try:
+        _notification_queue.put(None, timeout=timeout)
+    except queue.Full:
+        logger.warning("Notification queue is still full. Not all notifications could be sent before shutdown.")
+        return
+    worker.join(timeout)
+
+
 def send_notification(config: GlobalConfig, 
                       title: str, 
                       message: str,
@@ -277,18 +401,48 @@ def send_notification(config: GlobalConfig,
                       notification_context: NotificationContext | None = None,
                       ):
     """
+    Queue a notification for the sender thread and return immediately.
+    When the queue is full the notification is dropped instead of blocking the calling log stream.
+    """
+    _ensure_notification_worker()
+    # The notification is sent later by the sender thread. Stamp the time now so that the
+    # webhook info fields (get_defaults falls back to the current time) match the rendered title and message.
+    if notification_context is not None and notification_context.time is None:
+        notification_context.time = time.time()
+    try:
+        _notification_queue.put_nowait({
+            "config": config,
+            "title": title,
+            "message": message,
+            "modular_settings": modular_settings,
+            "attachment": attachment,
+            "notification_context": notification_context,
+        })
+    except queue.Full:
+        logger.warning(f"Notification queue is full ({NOTIFICATION_QUEUE_SIZE} pending). Dropping notification: {title}")
+
+
+def _send_notification(config: GlobalConfig, 
+                      title: str, 
+                      message: str,
+                      modular_settings: dict | None = None,
+                      attachment: LogAttachment | None = None,
+                      notification_context: NotificationContext | None = None,
+                      ):
+    """
     Dispatch a notification using ntfy, Apprise, and/or webhook based on configuration.
     Handles message formatting, file attachments, and host labeling.
     """
     message = message.replace(r"\n", "\n").strip() if message else ""
-    nc = config.notifications.model_dump(exclude_none=True)
-    ntfy_config = get_notification_config(modular_settings or {}, nc.get("ntfy", {}), NTFY_PREFIX, NTFY_KEYS)
-    apprise_url = get_notification_config(modular_settings or {}, nc.get("apprise", {}), APPRISE_PREFIX, APPRISE_KEYS).get("url")
-    webhook_config = get_notification_config(modular_settings or {}, nc.get("webhook", {}), WEBHOOK_PREFIX, WEBHOOK_KEYS)
+    global_ntfy, global_apprise, global_webhook = get_global_notification_configs(config)
+    ntfy_config = get_notification_config(modular_settings or {}, global_ntfy, NTFY_PREFIX, NTFY_KEYS)
+    apprise_url = get_notification_config(modular_settings or {}, global_apprise, APPRISE_PREFIX, APPRISE_KEYS).get("url")
+    webhook_config = get_notification_config(modular_settings or {}, global_webhook, WEBHOOK_PREFIX, WEBHOOK_KEYS)
 
     # Send ntfy notification if configured
     if ntfy_config and ntfy_config.get("url") and ntfy_config.get("topic"):
-        send_ntfy_notification(ntfy_config, message=message, title=title, attachment=attachment)
+        base_headers = get_global_ntfy_base_headers(config) if ntfy_config is global_ntfy else None
+        send_ntfy_notification(ntfy_config, message=message, title=title, attachment=attachment, base_headers=base_headers)
 
     # Send Apprise notification if configured   
     if apprise_url:
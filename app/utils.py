@@ -1,5 +1,7 @@
 from dataclasses import dataclass
+import functools
 import logging
+import threading
 from config.config_model import ModularSettings
 
 logger = logging.getLogger(__name__)
@@ -70,4 +72,31 @@ def convert_to_int(val, fallback_value: int = 0, min_value: int = 0) -> int:
             return fallback_value
         return val
     except (ValueError, TypeError):
-        return fallback_value
\ No newline at end of file
+        return fallback_value
+
+
+def cached_per_config(func):
+    """
+    Cache the results of func(config, *args) for the most recently used config object.
+    A reload replaces the config object as a whole, so the cache is invalidated by comparing identities.
+    Cached results are shared between callers and must not be mutated.
+    """
+    lock = threading.Lock()
+    cached_config = None
+    results: dict = {}
+
+    @functools.wraps(func)
+    def wrapper(config, *args):
+        nonlocal cached_config, results
+        with lock:
+            if cached_config is not config:
+                cached_config, results = config, {}
+            if args in results:
+                return results[args]
+        result = func(config, *args)
+        with lock:
+            if cached_config is config:
+                results[args] = result
+        return result
+
+    return wrapper